@@ -4,31 +4,103 @@ A production-ready Flask API for fetching monthly weather data using Google Gemi
 """
 
 import os
+import atexit
 import logging
+import queue
+import functools
 import json
-import random
 import hashlib
-from datetime import datetime
-from typing import Dict, Any, Optional
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, List, Optional, Tuple, TypedDict
 
-import google.generativeai as genai
-from flask import Flask, jsonify, request
-from flask_cors import CORS
+import httpx
+import numpy as np
+import orjson
+import redis
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging: request threads only enqueue records, a background
+# listener formats and writes them
+_log_queue = queue.Queue(-1)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+
+_log_listener: Optional[QueueListener] = None
+
+
+def _start_log_listener(log_queue: queue.Queue) -> None:
+    """Start a listener thread draining log_queue into the stream handler"""
+    global _log_listener
+    _log_listener = QueueListener(log_queue, _log_handler)
+    _log_listener.start()
+
+
+def _stop_log_listener() -> None:
+    """Flush pending records and stop the current listener"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+def _reset_logging_after_fork() -> None:
+    """
+    Give a forked child its own log queue and listener
+
+    Threads do not survive fork, and the inherited queue still holds records
+    the parent's listener will write (its lock may even be held mid-put), so
+    the child starts over with an empty queue.
+    """
+    _queue_handler.queue = queue.Queue(-1)
+    _start_log_listener(_queue_handler.queue)
+
+
+# The queue handler only merges args into the message; layout is applied by _log_handler
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    handlers=[_queue_handler]
 )
+
+_start_log_listener(_log_queue)
+atexit.register(_stop_log_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_logging_after_fork)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+
 # Initialize Flask app
 app = Flask(__name__)
-CORS(app, resources={r"/api/*": {"origins": "*"}})
+app.json = ORJSONProvider(app)
+
+# Compress JSON bodies; repeated field names in monthly_data shrink well
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
 
 # Configuration
 class Config:
@@ -36,6 +108,13 @@ class Config:
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     FLASK_ENV = os.getenv('FLASK_ENV', 'production')
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    REDIS_URL = os.getenv('REDIS_URL')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', str(86400 * 7)))
+    CITIES_MAX_AGE = 3600
+    CORS_ORIGIN = os.getenv('CORS_ORIGIN', '*')
+    WEATHER_MAX_AGE = 86400
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL')
+    GEMINI_API_BASE = os.getenv('GEMINI_API_BASE', 'https://generativelanguage.googleapis.com/v1beta')
 
 # Validate configuration
 if not Config.GEMINI_API_KEY:
@@ -51,19 +130,238 @@ CITIES = {
     'Paris': {'lat': 48.8566, 'lon': 2.3522, 'country': 'France'},
 }
 
+# CITIES never changes at runtime, so derived listings are built once
+CITY_NAMES = frozenset(CITIES)
+SORTED_CITY_NAMES = sorted(CITIES.keys())
+CITIES_LIST = [
+    {
+        'name': city,
+        'latitude': CITIES[city]['lat'],
+        'longitude': CITIES[city]['lon'],
+        'country': CITIES[city]['country']
+    }
+    for city in SORTED_CITY_NAMES
+]
+
+# Bodies that never change are serialized once at import
+CITIES_BODY = orjson.dumps({
+    'success': True,
+    'cities': CITIES_LIST
+})
+MISSING_CITY_BODY = orjson.dumps({
+    'success': False,
+    'error': 'City parameter is required',
+    'example': '/api/weather?city=Berlin'
+})
+UNEXPECTED_ERROR_BODY = orjson.dumps({
+    'success': False,
+    'error': 'An unexpected error occurred'
+})
+NOT_FOUND_BODY = orjson.dumps({
+    'success': False,
+    'error': 'Endpoint not found',
+    'available_endpoints': [
+        '/api/weather?city=CityName',
+        '/api/weather/batch?cities=City1,City2',
+        '/api/cities',
+        '/api/health'
+    ]
+})
+METHOD_NOT_ALLOWED_BODY = orjson.dumps({
+    'success': False,
+    'error': 'Method not allowed'
+})
+INTERNAL_ERROR_BODY = orjson.dumps({
+    'success': False,
+    'error': 'Internal server error'
+})
+
+
+def json_response(body: bytes, status: int) -> Response:
+    """
+    Wrap a pre-serialized JSON body in a response
+
+    A new response is built per request so handlers and after_request
+    hooks can safely modify headers.
+
+    Args:
+        body: Serialized JSON body
+        status: HTTP status code
+
+    Returns:
+        Flask response object
+    """
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+def body_etag(body: bytes) -> str:
+    """
+    Derive a strong ETag from serialized content
+
+    Args:
+        body: Serialized response content
+
+    Returns:
+        Hex digest identifying the content
+    """
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def cacheable(response: Response, etag: str, max_age: int, weak: bool = False) -> Response:
+    """
+    Mark a response as publicly cacheable and honour conditional requests
+
+    Args:
+        response: Successful response to decorate
+        etag: ETag for the response content
+        max_age: Seconds clients and proxies may reuse the response
+        weak: Send a weak ETag, for bodies that vary in ways the tag ignores
+
+    Returns:
+        The response, converted to 304 Not Modified if the client's copy is current
+    """
+    response.set_etag(etag, weak=weak)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    
+    # flask-compress tags compressed bodies "<etag>:<encoding>", so clients
+    # revalidate with that form; treat it as a match for the same content
+    for algorithm in app.config['COMPRESS_ALGORITHM']:
+        encoded_etag = f'{etag}:{algorithm}'
+        if request.if_none_match.contains_weak(encoded_etag):
+            response.set_etag(encoded_etag, weak=weak)
+            break
+    
+    return response.make_conditional(request)
+
+
+CITIES_ETAG = body_etag(CITIES_BODY)
+
+
+def _init_redis() -> Optional[redis.Redis]:
+    """
+    Connect to Redis when REDIS_URL is configured
+
+    Returns:
+        Redis client, or None if caching is disabled or Redis is unreachable
+    """
+    if not Config.REDIS_URL:
+        return None
+    try:
+        client = redis.Redis.from_url(Config.REDIS_URL, decode_responses=True, socket_timeout=1.0)
+        client.ping()
+        logger.info('Connected to Redis cache')
+        return client
+    except redis.RedisError as e:
+        logger.warning('Redis unavailable, caching disabled: %s', str(e)[:100])
+        return None
+
+
+# Redis client, connected on first use so importing the app never touches the network
+_REDIS_UNSET: Any = object()
+redis_client: Optional[redis.Redis] = _REDIS_UNSET
+_redis_client_lock = threading.Lock()
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    Return the process-wide Redis client, connecting on first use
+
+    Returns:
+        Redis client, or None if caching is disabled or Redis is unreachable
+    """
+    global redis_client
+    if redis_client is _REDIS_UNSET:
+        with _redis_client_lock:
+            if redis_client is _REDIS_UNSET:
+                redis_client = _init_redis()
+    return redis_client
+
+
+def cache_get(key: str) -> Optional[Any]:
+    """
+    Fetch a JSON value from the Redis cache
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Decoded value, or None on a miss or if the cache is unavailable
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+    try:
+        cached = client.get(key)
+    except redis.RedisError as e:
+        logger.warning('Redis lookup failed for %s: %s', key, str(e)[:100])
+        return None
+    if not cached:
+        return None
+    try:
+        return orjson.loads(cached)
+    except orjson.JSONDecodeError as e:
+        logger.warning('Ignoring undecodable cache value for %s: %s', key, str(e)[:100])
+        return None
+
+
+def cache_set(key: str, value: Any, ttl: int = Config.CACHE_TTL) -> None:
+    """
+    Store a JSON value in the Redis cache, ignoring cache failures
+
+    Args:
+        key: Cache key
+        value: JSON-serializable value
+        ttl: Expiry in seconds
+    """
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, orjson.dumps(value))
+    except redis.RedisError as e:
+        logger.warning('Redis store failed for %s: %s', key, str(e)[:100])
+
+
+# (epoch second, ISO 8601 string) for the most recently formatted timestamp
+_timestamp_cache = (0, '')
+
+
+def utc_timestamp() -> str:
+    """
+    Current UTC time as an ISO 8601 string with second precision
+
+    The formatted string is reused until the clock moves to the next second,
+    so busy endpoints skip the datetime construction and formatting.
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, cached_text = _timestamp_cache
+    if second != cached_second:
+        cached_text = datetime.fromtimestamp(second, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        _timestamp_cache = (second, cached_text)
+    return cached_text
+
 
 def generate_mock_weather(city_name: str) -> Dict[str, Any]:
     """
     Generate deterministic mock monthly weather data for the year 2024.
 
     This generator is seeded from the city name so the results are stable
-    between runs for the same city.
+    between runs for the same city. Results are memoized per process; each
+    call returns a fresh copy so callers may mutate it freely.
     """
+    cached = _generate_mock_weather_cached(city_name)
+    return {'data': [dict(entry) for entry in cached['data']]}
+
+
+@functools.lru_cache(maxsize=64)
+def _generate_mock_weather_cached(city_name: str) -> Dict[str, Any]:
+    """Memoized mock weather generator backing generate_mock_weather"""
     # Create a deterministic seed from the city name
-    seed = int(hashlib.sha256(city_name.encode('utf-8')).hexdigest(), 16) % (10 ** 8)
-    rnd = random.Random(seed)
+    seed = zlib.crc32(city_name.encode('utf-8'))
+    rng = np.random.default_rng(seed)
 
-    data = []
     # Simple baseline climates by heuristics on city name (very coarse)
     baseline_temp = 10.0
     if city_name.lower() in ('delhi', 'mumbai'):
@@ -75,35 +373,125 @@ def generate_mock_weather(city_name: str) -> Dict[str, Any]:
     elif city_name.lower() in ('tokyo',):
         baseline_temp = 15.0
 
-    for month in range(1, 13):
-        # Seasonal swing
-        seasonal = 10 * (1.0 - abs((month - 7) / 6.0))  # peak around mid-year for northern hemisphere
-        tavg = round(baseline_temp + seasonal * (rnd.random() * 0.6 + 0.7) - 6.0, 1)
-        tmin = round(tavg - (rnd.random() * 5.0 + 2.0), 1)
-        tmax = round(tavg + (rnd.random() * 5.0 + 2.0), 1)
-        prcp = round(max(0.0, rnd.gauss(50.0 - (seasonal * 2.0), 20.0)), 1)  # mm for month
-        wspd = round(max(0.0, rnd.gauss(12.0, 4.0)), 1)
-        pres = round(rnd.gauss(1013.0, 5.0), 1)
-        rhum = max(0, min(100, int(rnd.gauss(65.0, 15.0))))
-
-        entry = {
+    # Draw all twelve months of each variable at once
+    months = np.arange(1, 13)
+    seasonal = 10 * (1.0 - np.abs((months - 7) / 6.0))  # peak around mid-year for northern hemisphere
+    tavg = np.round(baseline_temp + seasonal * (rng.random(12) * 0.6 + 0.7) - 6.0, 1)
+    tmin = np.round(tavg - (rng.random(12) * 5.0 + 2.0), 1)
+    tmax = np.round(tavg + (rng.random(12) * 5.0 + 2.0), 1)
+    prcp = np.round(np.maximum(0.0, rng.normal(50.0 - (seasonal * 2.0), 20.0)), 1)  # mm for month
+    wspd = np.round(np.maximum(0.0, rng.normal(12.0, 4.0, 12)), 1)
+    pres = np.round(rng.normal(1013.0, 5.0, 12), 1)
+    rhum = np.clip(rng.normal(65.0, 15.0, 12).astype(int), 0, 100)
+
+    # tolist() converts to native Python numbers so the data stays JSON-serializable
+    data = [
+        {
             'date': f'2024-{month:02d}-01',
-            'tavg': tavg,
-            'tmin': tmin,
-            'tmax': tmax,
-            'prcp': prcp,
-            'wspd': wspd,
-            'pres': pres,
-            'rhum': rhum
+            'tavg': month_tavg,
+            'tmin': month_tmin,
+            'tmax': month_tmax,
+            'prcp': month_prcp,
+            'wspd': month_wspd,
+            'pres': month_pres,
+            'rhum': month_rhum
         }
-        data.append(entry)
+        for month, month_tavg, month_tmin, month_tmax, month_prcp, month_wspd, month_pres, month_rhum in zip(
+            months.tolist(), tavg.tolist(), tmin.tolist(), tmax.tolist(),
+            prcp.tolist(), wspd.tolist(), pres.tolist(), rhum.tolist()
+        )
+    ]
 
     return {'data': data}
 
 
+# Gemini prompts, split around the city names and kept free of indentation
+# since every input token is billed
+_MONTH_SCHEMA = (
+    '{"date": "2024-01-01", "tavg": average_temperature_celsius, '
+    '"tmin": minimum_temperature_celsius, "tmax": maximum_temperature_celsius, '
+    '"prcp": precipitation_mm, "wspd": wind_speed_kmh, "pres": pressure_hpa, '
+    '"rhum": humidity_percent}'
+)
+WEATHER_PROMPT_PREFIX = 'Provide monthly weather statistics for '
+WEATHER_PROMPT_MIDDLE = (
+    ' for the year 2024 (Jan-Dec).\n'
+    'For each month, provide the following data in JSON format:\n'
+    '{"data": [' + _MONTH_SCHEMA + ', ...12 months total]}\n'
+    'Provide realistic weather data for '
+)
+WEATHER_PROMPT_SUFFIX = '. Return ONLY valid JSON, no additional text.'
+BATCH_PROMPT_PREFIX = 'Provide monthly weather statistics for each of these cities for the year 2024 (Jan-Dec): '
+BATCH_PROMPT_SUFFIX = (
+    '.\nReturn the data in JSON format, keyed by the exact city names given:\n'
+    '{"results": {"CityName": {"data": [' + _MONTH_SCHEMA + ', ...12 months total]}}}\n'
+    'Provide realistic weather data for every city. Return ONLY valid JSON, no additional text.'
+)
+
+
+def is_weather_data(value: Any) -> bool:
+    """
+    Check that a value has the shape of monthly weather data
+
+    Args:
+        value: Parsed Gemini or cache value
+
+    Returns:
+        True if value is a dict with a non-empty 'data' list
+    """
+    return isinstance(value, dict) and isinstance(value.get('data'), list) and bool(value['data'])
+
+
+def extract_json(response_text: Optional[str]) -> Optional[Any]:
+    """
+    Parse JSON from a Gemini response, tolerating surrounding text
+
+    Args:
+        response_text: Raw text returned by the model
+
+    Returns:
+        Parsed JSON value, or None if no JSON object could be found
+    """
+    if not response_text:
+        return None
+    
+    response_text = response_text.strip()
+    
+    # Try to parse JSON directly
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        # If direct parsing fails, try to extract JSON from the response
+        logger.warning('JSON parsing failed, attempting to extract JSON from response')
+    
+    # Find JSON in the response
+    start_idx = response_text.find('{')
+    end_idx = response_text.rfind('}') + 1
+    
+    if start_idx == -1 or end_idx <= start_idx:
+        return None
+    
+    try:
+        return json.loads(response_text[start_idx:end_idx])
+    except json.JSONDecodeError:
+        return None
+
+
 class WeatherAPIClient:
     """Client for interacting with Google Gemini API for weather data"""
     
+    # Models in order of preference
+    MODEL_OPTIONS = [
+        'models/gemini-2.5-flash',
+        'models/gemini-2.5-pro',
+        'models/gemini-2.0-flash',
+        'models/gemini-flash-latest',
+        'models/gemini-pro-latest',
+        'models/gemini-1.5-flash',
+        'models/gemini-pro'
+    ]
+    MODEL_CACHE_KEY = 'gemini:chosen_model'
+    
     def __init__(self, api_key: str):
         """
         Initialize the Weather API client
@@ -112,36 +500,162 @@ class WeatherAPIClient:
             api_key: Google Gemini API key
         """
         self.api_key = api_key
-        genai.configure(api_key=api_key)
-        
-        # Try different models in order of preference (use models detected from API)
-        model_options = [
-            'models/gemini-2.5-flash',
-            'models/gemini-2.5-pro',
-            'models/gemini-2.0-flash',
-            'models/gemini-flash-latest',
-            'models/gemini-pro-latest',
-            'models/gemini-1.5-flash',
-            'models/gemini-pro'
-        ]
         
-        self.model = None
-        for model_name in model_options:
-            try:
-                self.model = genai.GenerativeModel(model_name)
-                # Test if model works
-                self.model.generate_content("test")
-                logger.info(f'Successfully initialized model: {model_name}')
-                break
-            except Exception as e:
-                logger.warning(f'Model {model_name} not available: {str(e)[:100]}')
-                continue
+        # Shared keep-alive pool so repeat calls skip the TCP/TLS handshake;
+        # failed connection attempts are retried before surfacing an error
+        self._http = httpx.Client(
+            base_url=Config.GEMINI_API_BASE,
+            headers={'x-goog-api-key': api_key or ''},
+            transport=httpx.HTTPTransport(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                http2=True,
+                retries=3
+            ),
+            timeout=30.0
+        )
+        
+        try:
+            self.model = self._select_model()
+        except Exception:
+            # Release the pool so a failed construction does not leak connections
+            self.close()
+            raise
+        atexit.register(self.close)
         
         if not self.model:
             logger.error('No suitable Gemini model available. Check API key and available models. Falling back to mock data if enabled.')
             # Do not raise here; allow the application to continue and use mock data when needed
             self.model = None
     
+    def _select_model(self) -> Optional[str]:
+        """
+        Pick the first preferred model that the API key has access to
+        
+        GEMINI_MODEL takes precedence when set. Otherwise models are matched
+        against a single list_models() call rather than probed with test
+        prompts, and the choice is shared through the cache so other workers
+        skip the lookup.
+        
+        Returns:
+            Model name, or None if no preferred model is available
+        """
+        if not self.api_key:
+            return None
+        
+        if Config.GEMINI_MODEL:
+            logger.info('Using configured model: %s', Config.GEMINI_MODEL)
+            return Config.GEMINI_MODEL
+        
+        cached = self._get_shared_model()
+        if cached in self.MODEL_OPTIONS:
+            logger.info('Using cached model choice: %s', cached)
+            return cached
+        
+        try:
+            available = self.list_models()
+        except Exception as e:
+            logger.warning('Could not list Gemini models: %s', str(e)[:100])
+            return None
+        
+        for model_name in self.MODEL_OPTIONS:
+            if model_name in available:
+                logger.info('Successfully initialized model: %s', model_name)
+                self._share_model(model_name)
+                return model_name
+        
+        return None
+    
+    def _get_shared_model(self) -> Optional[str]:
+        """
+        Read the model choice shared between workers
+        
+        The key holds a plain model name (not JSON) so operators can seed it
+        with SETNX. Any failure is treated as a miss.
+        
+        Returns:
+            Shared model name, or None if unset or unavailable
+        """
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            return client.get(self.MODEL_CACHE_KEY)
+        except redis.RedisError as e:
+            logger.warning('Redis lookup failed for %s: %s', self.MODEL_CACHE_KEY, str(e)[:100])
+            return None
+    
+    def _share_model(self, model_name: str) -> None:
+        """
+        Publish the model choice for other workers, keeping any existing value
+        
+        Args:
+            model_name: Selected model name
+        """
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.set(self.MODEL_CACHE_KEY, model_name, nx=True, ex=86400)
+        except redis.RedisError as e:
+            logger.warning('Redis store failed for %s: %s', self.MODEL_CACHE_KEY, str(e)[:100])
+    
+    def list_models(self) -> set:
+        """
+        Fetch the names of models available to the configured API key
+        
+        Returns:
+            Set of model names (e.g. 'models/gemini-2.5-flash')
+            
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        response = self._http.get('/models', params={'pageSize': 1000})
+        response.raise_for_status()
+        return {model['name'] for model in response.json().get('models', [])}
+    
+    def close(self) -> None:
+        """Close pooled connections to the Gemini API"""
+        self._http.close()
+    
+    def generate_content(self, prompt: str, model_name: Optional[str] = None) -> str:
+        """
+        Send a prompt to the Gemini streamGenerateContent REST endpoint
+        
+        The response is read as server-sent events and each event is decoded
+        as it arrives, so only the extracted text is held in memory rather
+        than the full response envelope.
+        
+        Args:
+            prompt: Prompt text
+            model_name: Model to use, defaults to the initialized model
+            
+        Returns:
+            Concatenated text of the first candidate (empty if none)
+            
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        chunks = []
+        with self._http.stream(
+            'POST',
+            f'/{model_name or self.model}:streamGenerateContent',
+            params={'alt': 'sse'},
+            json={'contents': [{'parts': [{'text': prompt}]}]}
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith('data:'):
+                    continue
+                candidates = orjson.loads(line[5:]).get('candidates') or [{}]
+                for part in candidates[0].get('content', {}).get('parts', []):
+                    chunks.append(part.get('text', ''))
+        return ''.join(chunks)
+    
+    @property
+    def use_mock_data(self) -> bool:
+        """Whether weather data is served from the deterministic mock generator"""
+        return os.getenv('USE_MOCK_DATA', 'False').lower() == 'true' or not self.model
+    
     def get_monthly_weather(
         self,
         city_name: str
@@ -157,77 +671,150 @@ class WeatherAPIClient:
         """
         try:
             # If configured to use mock data, or if no Gemini model was initialized, return deterministic mock data
-            use_mock = os.getenv('USE_MOCK_DATA', 'False').lower() == 'true'
-            if use_mock or not self.model:
-                logger.info(f'Using mock weather data for {city_name} (use_mock={use_mock}, model_available={self.model is not None})')
+            if self.use_mock_data:
+                logger.info('Using mock weather data for %s (model_available=%s)', city_name, self.model is not None)
                 return generate_mock_weather(city_name)
-            logger.info(f'Fetching weather data for {city_name} via Gemini API')
+            
+            # 2024 data never changes, so a cached result can be served as-is
+            cache_key = f'weather:{city_name.lower()}:2024'
+            cached = cache_get(cache_key)
+            if is_weather_data(cached):
+                logger.info('Cache hit for %s weather data', city_name)
+                return cached
+            
+            logger.info('Fetching weather data for %s via Gemini API', city_name)
             
             # Craft a detailed prompt for Gemini to fetch weather data
-            prompt = f"""
-            Provide monthly weather statistics for {city_name} for the year 2024 (Jan-Dec).
+            prompt = WEATHER_PROMPT_PREFIX + city_name + WEATHER_PROMPT_MIDDLE + city_name + WEATHER_PROMPT_SUFFIX
             
-            For each month, provide the following data in JSON format:
-            {{
-              "data": [
-                {{
-                  "date": "2024-01-01",
-                  "tavg": average_temperature_celsius,
-                  "tmin": minimum_temperature_celsius,
-                  "tmax": maximum_temperature_celsius,
-                  "prcp": precipitation_mm,
-                  "wspd": wind_speed_kmh,
-                  "pres": pressure_hpa,
-                  "rhum": humidity_percent
-                }},
-                ...12 months total
-              ]
-            }}
+            response_text = self.generate_content(prompt)
             
-            Provide realistic weather data for {city_name}. Return ONLY valid JSON, no additional text.
-            """
+            if not response_text:
+                logger.error('Empty response from Gemini API for %s', city_name)
+                return None
             
-            response = self.model.generate_content(prompt)
+            data = extract_json(response_text)
+            if data is None:
+                logger.error('Could not extract JSON from Gemini response for %s', city_name)
+                return None
             
-            if not response.text:
-                logger.error(f'Empty response from Gemini API for {city_name}')
+            # Only well-formed data is cached; anything else (e.g. an error object) fails the request
+            if not is_weather_data(data):
+                logger.error('Gemini response for %s has no monthly data', city_name)
                 return None
             
-            # Extract JSON from response
-            response_text = response.text.strip()
+            logger.info('Successfully fetched weather data for %s', city_name)
+            cache_set(cache_key, data)
+            return data
+        
+        except Exception as e:
+            logger.error('Error fetching weather data for %s: %s', city_name, e)
+            return None
+    
+    def get_monthly_weather_batch(
+        self,
+        cities: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch monthly weather data for several cities with a single Gemini request
+        
+        Cities already in the cache are served from it; the rest are requested
+        together in one prompt and cached individually.
+        
+        Args:
+            cities: Names of the cities
+            
+        Returns:
+            Dictionary mapping city name to monthly weather data. Cities whose
+            data could not be fetched are omitted.
+        """
+        if self.use_mock_data:
+            logger.info('Using mock weather data for %s cities (model_available=%s)', len(cities), self.model is not None)
+            return {city_name: generate_mock_weather(city_name) for city_name in cities}
+        
+        results = {}
+        missing = []
+        for city_name in cities:
+            cached = cache_get(f'weather:{city_name.lower()}:2024')
+            if is_weather_data(cached):
+                results[city_name] = cached
+            else:
+                missing.append(city_name)
+        
+        if not missing:
+            logger.info('Cache hit for all %s cities in batch', len(cities))
+            return results
+        
+        try:
+            logger.info('Fetching weather data for %s via a single Gemini API request', ', '.join(missing))
+            
+            city_list = ', '.join(missing)
+            prompt = BATCH_PROMPT_PREFIX + city_list + BATCH_PROMPT_SUFFIX
+            
+            data = extract_json(self.generate_content(prompt))
+            batch = data.get('results') if isinstance(data, dict) else None
             
-            # Try to parse JSON directly
-            try:
-                data = json.loads(response_text)
-                logger.info(f'Successfully fetched weather data for {city_name}')
-                return data
-            except json.JSONDecodeError:
-                # If direct parsing fails, try to extract JSON from the response
-                logger.warning(f'JSON parsing failed, attempting to extract JSON from response for {city_name}')
-                
-                # Find JSON in the response
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = response_text[start_idx:end_idx]
-                    data = json.loads(json_str)
-                    logger.info(f'Successfully extracted and parsed weather data for {city_name}')
-                    return data
+            if not isinstance(batch, dict):
+                logger.error('Could not extract batch JSON from Gemini response for %s', city_list)
+                return results
+            
+            for city_name in missing:
+                city_data = batch.get(city_name)
+                if is_weather_data(city_data):
+                    results[city_name] = city_data
+                    cache_set(f'weather:{city_name.lower()}:2024', city_data)
                 else:
-                    logger.error(f'Could not extract JSON from Gemini response for {city_name}')
-                    return None
+                    logger.error('Gemini batch response is missing data for %s', city_name)
         
         except Exception as e:
-            logger.error(f'Error fetching weather data for {city_name}: {str(e)}')
-            return None
+            logger.error('Error fetching batch weather data for %s: %s', ', '.join(missing), e)
+        
+        return results
+
+
+class Temperature(TypedDict):
+    """Monthly temperature statistics in degrees Celsius"""
+    avg: Optional[float]
+    min: Optional[float]
+    max: Optional[float]
+
+
+class MonthlyEntry(TypedDict):
+    """Weather statistics for one month"""
+    month: str
+    temperature: Temperature
+    precipitation: Optional[float]
+    wind_speed: Optional[float]
+    pressure: Optional[float]
+    humidity: Optional[int]
+
+
+class Location(TypedDict):
+    """City coordinates and country"""
+    latitude: float
+    longitude: float
+    country: str
+
+
+class WeatherPayload(TypedDict):
+    """Weather response body without the per-request timestamp"""
+    success: bool
+    city: str
+    location: Location
+    year: int
+    monthly_data: List[MonthlyEntry]
+
+
+class WeatherResponse(WeatherPayload):
+    """Weather response body as sent to clients"""
+    timestamp: str
 
 
 def format_weather_response(
     city_name: str,
     weather_data: Dict[str, Any],
     city_info: Dict[str, Any]
-) -> Dict[str, Any]:
+) -> WeatherResponse:
     """
     Format the raw API response into a structured JSON response
     
@@ -239,41 +826,125 @@ def format_weather_response(
     Returns:
         Formatted response dictionary
     """
-    monthly_data = []
+    payload = _format_weather_payload(city_name, weather_data, city_info)
+    return WeatherResponse(**payload, timestamp=utc_timestamp())
+
+
+def _format_weather_payload(
+    city_name: str,
+    weather_data: Dict[str, Any],
+    city_info: Dict[str, Any]
+) -> WeatherPayload:
+    """Build the response body for format_weather_response, minus the timestamp"""
+    monthly_data: List[MonthlyEntry] = []
     
     if 'data' in weather_data:
         for entry in weather_data['data']:
-            monthly_data.append({
-                'month': entry.get('date', 'N/A'),
-                'temperature': {
-                    'avg': entry.get('tavg'),
-                    'min': entry.get('tmin'),
-                    'max': entry.get('tmax')
-                },
-                'precipitation': entry.get('prcp'),
-                'wind_speed': entry.get('wspd'),
-                'pressure': entry.get('pres'),
-                'humidity': entry.get('rhum')
-            })
-    
-    return {
-        'success': True,
-        'city': city_name,
-        'location': {
-            'latitude': city_info['lat'],
-            'longitude': city_info['lon'],
-            'country': city_info['country']
-        },
-        'year': 2024,
-        'monthly_data': monthly_data,
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
-    }
+            monthly_data.append(MonthlyEntry(
+                month=entry.get('date', 'N/A'),
+                temperature=Temperature(
+                    avg=entry.get('tavg'),
+                    min=entry.get('tmin'),
+                    max=entry.get('tmax')
+                ),
+                precipitation=entry.get('prcp'),
+                wind_speed=entry.get('wspd'),
+                pressure=entry.get('pres'),
+                humidity=entry.get('rhum')
+            ))
+    
+    return WeatherPayload(
+        success=True,
+        city=city_name,
+        location=Location(
+            latitude=city_info['lat'],
+            longitude=city_info['lon'],
+            country=city_info['country']
+        ),
+        year=2024,
+        monthly_data=monthly_data
+    )
 
 
-# Initialize API client
-weather_client = WeatherAPIClient(
-    api_key=Config.GEMINI_API_KEY
-)
+def serialize_payload(payload: WeatherPayload) -> Tuple[bytes, str]:
+    """
+    Serialize a timestamp-free weather payload once for reuse across requests
+
+    Args:
+        payload: Response body without timestamp
+
+    Returns:
+        Tuple of (serialized JSON object, ETag for the weather data)
+    """
+    body = orjson.dumps(payload)
+    return body, body_etag(body)
+
+
+def with_timestamp(body: bytes) -> bytes:
+    """
+    Append the current timestamp to a serialized weather payload
+
+    Args:
+        body: Serialized JSON object from serialize_payload
+
+    Returns:
+        Serialized WeatherResponse
+    """
+    return body[:-1] + b',"timestamp":"' + utc_timestamp().encode('ascii') + b'"}'
+
+
+# Mock data and city metadata are both fixed per city, so every mock
+# response body is serialized up front
+MOCK_WEATHER_BODIES = {
+    city_name: serialize_payload(_format_weather_payload(
+        city_name,
+        _generate_mock_weather_cached(city_name),
+        city_info
+    ))
+    for city_name, city_info in CITIES.items()
+}
+
+# Gemini response bodies as (body, ETag, fetched at), filled in as each city
+# is fetched and re-read from Redis or the API once older than CACHE_TTL
+_gemini_weather_bodies: Dict[str, Tuple[bytes, str, float]] = {}
+
+
+# API client, built lazily so each worker creates its own connection pool
+_weather_client: Optional[WeatherAPIClient] = None
+_weather_client_lock = threading.Lock()
+
+
+def get_weather_client() -> WeatherAPIClient:
+    """
+    Return the process-wide Weather API client, creating it on first use
+
+    Deferring construction keeps imports fast and means pre-forking servers
+    (e.g. gunicorn --preload) never share HTTP connections between workers.
+
+    Returns:
+        Shared WeatherAPIClient instance
+    """
+    global _weather_client
+    if _weather_client is None:
+        with _weather_client_lock:
+            if _weather_client is None:
+                _weather_client = WeatherAPIClient(
+                    api_key=Config.GEMINI_API_KEY
+                )
+    return _weather_client
+
+
+@app.after_request
+def add_cors_headers(response: Response) -> Response:
+    """Allow cross-origin access to /api/* endpoints"""
+    if request.path.startswith('/api/'):
+        response.headers['Access-Control-Allow-Origin'] = Config.CORS_ORIGIN
+        if request.method == 'OPTIONS':
+            response.headers['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
+            request_headers = request.headers.get('Access-Control-Request-Headers')
+            if request_headers:
+                response.headers['Access-Control-Allow-Headers'] = request_headers
+    return response
 
 
 @app.route('/api/weather', methods=['GET'])
@@ -295,55 +966,187 @@ def get_weather():
         500: Server error (API failure)
     """
     try:
-        # Get city parameter
-        city_name = request.args.get('city', '').strip()
+        # Get city parameter (only strip when something was passed)
+        city_name = request.args.get('city')
+        if city_name:
+            city_name = city_name.strip()
         
         # Validate city parameter
         if not city_name:
             logger.warning('Weather request without city parameter')
-            return jsonify({
-                'success': False,
-                'error': 'City parameter is required',
-                'example': '/api/weather?city=Berlin'
-            }), 400
+            return json_response(MISSING_CITY_BODY, 400)
         
-        if city_name not in CITIES:
-            logger.warning(f'Weather request for invalid city: {city_name}')
-            available_cities = ', '.join(sorted(CITIES.keys()))
+        if city_name not in CITY_NAMES:
+            logger.warning('Weather request for invalid city: %s', city_name)
             return jsonify({
                 'success': False,
                 'error': f'Invalid city: {city_name}',
-                'available_cities': sorted(list(CITIES.keys())),
+                'available_cities': SORTED_CITY_NAMES,
                 'example': '/api/weather?city=Berlin'
             }), 400
         
         # Get city coordinates
         city_info = CITIES[city_name]
         
+        weather_client = get_weather_client()
+        
+        # Serve a pre-serialized body; Gemini bodies are built on first use from Redis or the API
+        if weather_client.use_mock_data:
+            body, etag = MOCK_WEATHER_BODIES[city_name]
+        else:
+            cached = _get_gemini_body(weather_client, city_name, city_info)
+            if cached is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Failed to fetch weather data from external API',
+                    'city': city_name
+                }), 500
+            body, etag = cached
+        
+        # The ETag covers the weather data only, so it stays stable as the timestamp
+        # advances; since the bytes still change, it must be a weak validator
+        return cacheable(json_response(with_timestamp(body), 200), etag, Config.WEATHER_MAX_AGE, weak=True)
+    
+    except Exception as e:
+        logger.error('Unexpected error in get_weather endpoint: %s', e, exc_info=True)
+        return json_response(UNEXPECTED_ERROR_BODY, 500)
+
+
+def _get_gemini_body(
+    weather_client: WeatherAPIClient,
+    city_name: str,
+    city_info: Dict[str, Any]
+) -> Optional[Tuple[bytes, str]]:
+    """
+    Return a city's pre-serialized Gemini body, refreshing it after CACHE_TTL
+    
+    Args:
+        weather_client: Client used on a cache miss
+        city_name: Name of the city
+        city_info: City metadata
+        
+    Returns:
+        Tuple of (serialized payload, ETag), or None if the data could not be fetched
+    """
+    now = time.monotonic()
+    cached = _gemini_weather_bodies.get(city_name)
+    if cached is not None and now - cached[2] < Config.CACHE_TTL:
+        return cached[0], cached[1]
+    
+    payload = _get_gemini_payload(weather_client, city_name, city_info)
+    if payload is None:
+        return None
+    
+    body, etag = serialize_payload(payload)
+    _gemini_weather_bodies[city_name] = (body, etag, now)
+    return body, etag
+
+
+def _get_gemini_payload(
+    weather_client: WeatherAPIClient,
+    city_name: str,
+    city_info: Dict[str, Any]
+) -> Optional[WeatherPayload]:
+    """
+    Fetch a city's timestamp-free response body, using the Redis cache when possible
+    
+    Args:
+        weather_client: Client used on a cache miss
+        city_name: Name of the city
+        city_info: City metadata
+        
+    Returns:
+        Response body without timestamp, or None if the data could not be fetched
+    """
+    cache_key = f'resp:v2:{city_name.lower()}'
+    payload = cache_get(cache_key)
+    
+    if not (isinstance(payload, dict) and payload.get('monthly_data')):
         # Fetch weather data
         weather_data = weather_client.get_monthly_weather(
             city_name=city_name
         )
         
         if weather_data is None:
-            logger.error(f'Failed to fetch weather data for {city_name}')
+            logger.error('Failed to fetch weather data for %s', city_name)
+            return None
+        
+        # Format response
+        payload = _format_weather_payload(city_name, weather_data, city_info)
+        cache_set(cache_key, payload)
+    
+    return payload
+
+
+@app.route('/api/weather/batch', methods=['GET'])
+def get_weather_batch():
+    """
+    GET /api/weather/batch?cities=City1,City2
+    
+    Fetch monthly weather data for several cities in one request
+    
+    Query Parameters:
+        cities (string, required): Comma-separated city names
+        
+    Returns:
+        JSON response with monthly weather data for each city
+        
+    Status Codes:
+        200: Success (cities that failed are listed in failed_cities)
+        400: Bad request (missing or invalid cities)
+        500: Server error (API failure for every city)
+    """
+    try:
+        # Parse and de-duplicate the requested cities, preserving order
+        raw_cities = request.args.get('cities', '')
+        city_names = list(dict.fromkeys(
+            city.strip() for city in raw_cities.split(',') if city.strip()
+        ))
+        
+        if not city_names:
+            logger.warning('Batch weather request without cities parameter')
+            return jsonify({
+                'success': False,
+                'error': 'Cities parameter is required',
+                'example': '/api/weather/batch?cities=Berlin,Delhi'
+            }), 400
+        
+        invalid_cities = [city for city in city_names if city not in CITY_NAMES]
+        if invalid_cities:
+            logger.warning('Batch weather request for invalid cities: %s', ', '.join(invalid_cities))
+            return jsonify({
+                'success': False,
+                'error': f'Invalid cities: {", ".join(invalid_cities)}',
+                'available_cities': SORTED_CITY_NAMES,
+                'example': '/api/weather/batch?cities=Berlin,Delhi'
+            }), 400
+        
+        # Fetch weather data for all cities at once
+        weather_data = get_weather_client().get_monthly_weather_batch(city_names)
+        
+        if not weather_data:
+            logger.error('Failed to fetch batch weather data for %s', ', '.join(city_names))
             return jsonify({
                 'success': False,
                 'error': 'Failed to fetch weather data from external API',
-                'city': city_name
+                'cities': city_names
             }), 500
         
-        # Format response
-        response = format_weather_response(city_name, weather_data, city_info)
+        results = [
+            format_weather_response(city, weather_data[city], CITIES[city])
+            for city in city_names
+            if city in weather_data
+        ]
         
-        return jsonify(response), 200
+        return jsonify({
+            'success': True,
+            'results': results,
+            'failed_cities': [city for city in city_names if city not in weather_data]
+        }), 200
     
     except Exception as e:
-        logger.error(f'Unexpected error in get_weather endpoint: {str(e)}', exc_info=True)
-        return jsonify({
-            'success': False,
-            'error': 'An unexpected error occurred'
-        }), 500
+        logger.error('Unexpected error in get_weather_batch endpoint: %s', e, exc_info=True)
+        return json_response(UNEXPECTED_ERROR_BODY, 500)
 
 
 @app.route('/api/cities', methods=['GET'])
@@ -360,27 +1163,11 @@ def get_available_cities():
         200: Success
     """
     try:
-        cities_list = [
-            {
-                'name': city,
-                'latitude': info['lat'],
-                'longitude': info['lon'],
-                'country': info['country']
-            }
-            for city, info in CITIES.items()
-        ]
-        
-        return jsonify({
-            'success': True,
-            'cities': sorted(cities_list, key=lambda x: x['name'])
-        }), 200
+        return cacheable(json_response(CITIES_BODY, 200), CITIES_ETAG, Config.CITIES_MAX_AGE)
     
     except Exception as e:
-        logger.error(f'Error in get_available_cities endpoint: {str(e)}', exc_info=True)
-        return jsonify({
-            'success': False,
-            'error': 'An unexpected error occurred'
-        }), 500
+        logger.error('Error in get_available_cities endpoint: %s', e, exc_info=True)
+        return json_response(UNEXPECTED_ERROR_BODY, 500)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -400,45 +1187,31 @@ def health_check():
         'status': 'healthy',
         'service': 'Weather Analytics Dashboard API',
         'environment': Config.FLASK_ENV,
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': utc_timestamp()
     }), 200
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return jsonify({
-        'success': False,
-        'error': 'Endpoint not found',
-        'available_endpoints': [
-            '/api/weather?city=CityName',
-            '/api/cities',
-            '/api/health'
-        ]
-    }), 404
+    return json_response(NOT_FOUND_BODY, 404)
 
 
 @app.errorhandler(405)
 def method_not_allowed(error):
     """Handle 405 errors"""
-    return jsonify({
-        'success': False,
-        'error': 'Method not allowed'
-    }), 405
+    return json_response(METHOD_NOT_ALLOWED_BODY, 405)
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    logger.error(f'Internal server error: {str(error)}', exc_info=True)
-    return jsonify({
-        'success': False,
-        'error': 'Internal server error'
-    }), 500
+    logger.error('Internal server error: %s', error, exc_info=True)
+    return json_response(INTERNAL_ERROR_BODY, 500)
 
 
 if __name__ == '__main__':
-    logger.info(f'Starting Weather Analytics Dashboard API (Environment: {Config.FLASK_ENV})')
+    logger.info('Starting Weather Analytics Dashboard API (Environment: %s)', Config.FLASK_ENV)
     app.run(
         host='0.0.0.0',
         port=5000,
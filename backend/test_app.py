@@ -3,8 +3,12 @@ Unit tests for the Weather Analytics Dashboard API
 Run with: pytest test_app.py
 """
 
+import os
+import logging
 import pytest
 import json
+import httpx
+import app as backend
 from app import app, CITIES
 
 
@@ -43,6 +47,13 @@ class TestWeatherEndpoint:
         assert data['success'] is False
         assert 'City parameter is required' in data['error']
     
+    def test_whitespace_city_parameter(self, client):
+        """Test GET /api/weather with a whitespace-only city parameter"""
+        response = client.get('/api/weather?city=%20%20')
+        assert response.status_code == 400
+        data = response.get_json()
+        assert 'City parameter is required' in data['error']
+    
     def test_invalid_city(self, client):
         """Test GET /api/weather with invalid city"""
         response = client.get('/api/weather?city=InvalidCity')
@@ -124,6 +135,150 @@ class TestWeatherEndpoint:
                 assert 'timestamp' in data
 
 
+class TestPreserializedResponses:
+    """Test pre-serialized weather response bodies"""
+    
+    def test_mock_body_matches_formatted_response(self, client, monkeypatch):
+        """Test that the pre-serialized body equals the formatted response"""
+        monkeypatch.setenv('USE_MOCK_DATA', 'true')
+        monkeypatch.setattr(backend, 'utc_timestamp', lambda: '2024-01-01T00:00:00Z')
+        response = client.get('/api/weather?city=Mumbai')
+        expected = backend.format_weather_response(
+            'Mumbai', backend.generate_mock_weather('Mumbai'), CITIES['Mumbai']
+        )
+        assert response.status_code == 200
+        assert response.get_json() == expected
+    
+    def test_with_timestamp_appends_field(self, monkeypatch):
+        """Test that the timestamp is spliced into the serialized object"""
+        monkeypatch.setattr(backend, 'utc_timestamp', lambda: '2024-01-01T00:00:00Z')
+        body = backend.with_timestamp(b'{"success":true}')
+        assert json.loads(body) == {'success': True, 'timestamp': '2024-01-01T00:00:00Z'}
+
+
+class TestGeminiBodyCache:
+    """Test the in-process cache of Gemini response bodies"""
+    
+    def test_entries_expire_after_cache_ttl(self, monkeypatch):
+        """Test that a body is re-fetched once older than CACHE_TTL"""
+        monkeypatch.setattr(backend, '_gemini_weather_bodies', {})
+        fetches = []
+        
+        def fake_payload(weather_client, city_name, city_info):
+            fetches.append(city_name)
+            return backend._format_weather_payload(
+                city_name, backend.generate_mock_weather(city_name), city_info
+            )
+        
+        monkeypatch.setattr(backend, '_get_gemini_payload', fake_payload)
+        clock = [1000.0]
+        monkeypatch.setattr(backend.time, 'monotonic', lambda: clock[0])
+        
+        backend._get_gemini_body(None, 'Berlin', CITIES['Berlin'])
+        clock[0] += backend.Config.CACHE_TTL - 1
+        backend._get_gemini_body(None, 'Berlin', CITIES['Berlin'])
+        assert fetches == ['Berlin']
+        
+        clock[0] += 2
+        backend._get_gemini_body(None, 'Berlin', CITIES['Berlin'])
+        assert fetches == ['Berlin', 'Berlin']
+    
+    def test_failed_fetch_not_stored(self, monkeypatch):
+        """Test that a failed fetch leaves no entry behind"""
+        monkeypatch.setattr(backend, '_gemini_weather_bodies', {})
+        monkeypatch.setattr(backend, '_get_gemini_payload', lambda *args: None)
+        assert backend._get_gemini_body(None, 'Delhi', CITIES['Delhi']) is None
+        assert backend._gemini_weather_bodies == {}
+
+
+class TestHTTPCaching:
+    """Test ETag and Cache-Control handling"""
+    
+    def test_cities_conditional_request(self, client):
+        """Test that /api/cities answers 304 for a matching ETag"""
+        response = client.get('/api/cities')
+        assert response.status_code == 200
+        assert 'public' in response.headers['Cache-Control']
+        etag = response.headers['ETag']
+        assert not etag.startswith('W/')
+        
+        response = client.get('/api/cities', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+    
+    def test_weather_etag_ignores_timestamp(self, client, monkeypatch):
+        """Test that the weather ETag is stable as the timestamp changes"""
+        monkeypatch.setenv('USE_MOCK_DATA', 'true')
+        monkeypatch.setattr(backend, 'utc_timestamp', lambda: '2024-01-01T00:00:00Z')
+        first = client.get('/api/weather?city=Paris')
+        monkeypatch.setattr(backend, 'utc_timestamp', lambda: '2024-01-01T00:00:05Z')
+        second = client.get('/api/weather?city=Paris')
+        assert first.status_code == 200
+        assert first.headers['ETag'].startswith('W/"')
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert 'max-age=86400' in first.headers['Cache-Control']
+        
+        response = client.get('/api/weather?city=Paris', headers={'If-None-Match': first.headers['ETag']})
+        assert response.status_code == 304
+
+
+class TestCompression:
+    """Test response compression"""
+    
+    def test_weather_response_compressed(self, client, monkeypatch):
+        """Test that large JSON bodies are compressed when the client accepts it"""
+        monkeypatch.setenv('USE_MOCK_DATA', 'true')
+        response = client.get('/api/weather?city=Berlin', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        
+        etag = response.headers['ETag']
+        assert etag.startswith('W/"')
+        assert etag.endswith(':gzip"')
+        response = client.get(
+            '/api/weather?city=Berlin',
+            headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag}
+        )
+        assert response.status_code == 304
+    
+    def test_small_response_not_compressed(self, client):
+        """Test that bodies below the size threshold are sent as-is"""
+        response = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+
+class TestBatchWeatherEndpoint:
+    """Test cases for /api/weather/batch endpoint"""
+    
+    def test_missing_cities_parameter(self, client):
+        """Test GET /api/weather/batch without cities parameter"""
+        response = client.get('/api/weather/batch?cities=,')
+        assert response.status_code == 400
+        data = response.get_json()
+        assert data['success'] is False
+        assert 'Cities parameter is required' in data['error']
+    
+    def test_invalid_cities(self, client):
+        """Test GET /api/weather/batch with an unsupported city"""
+        response = client.get('/api/weather/batch?cities=Berlin,InvalidCity')
+        assert response.status_code == 400
+        data = response.get_json()
+        assert data['success'] is False
+        assert 'InvalidCity' in data['error']
+        assert 'available_cities' in data
+    
+    def test_batch_mock_data(self, client, monkeypatch):
+        """Test that each requested city is returned once, in order"""
+        monkeypatch.setenv('USE_MOCK_DATA', 'true')
+        response = client.get('/api/weather/batch?cities=Tokyo, Berlin,Tokyo')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['success'] is True
+        assert [result['city'] for result in data['results']] == ['Tokyo', 'Berlin']
+        assert data['failed_cities'] == []
+        assert len(data['results'][0]['monthly_data']) == 12
+
+
 class TestConfigurationValidation:
     """Test configuration and validation"""
     
@@ -144,15 +299,257 @@ class TestConfigurationValidation:
             assert isinstance(coords['country'], str)
 
 
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis client"""
+    
+    def __init__(self):
+        self.store = {}
+    
+    def get(self, key):
+        return self.store.get(key)
+    
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+    
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+
+class TestCaching:
+    """Test Redis caching helpers"""
+    
+    def test_cache_disabled_without_redis(self, monkeypatch):
+        """Test that cache lookups miss when Redis is not configured"""
+        monkeypatch.setattr(backend, 'redis_client', None)
+        backend.cache_set('weather:berlin:2024', {'data': []})
+        assert backend.cache_get('weather:berlin:2024') is None
+    
+    def test_cache_round_trip(self, monkeypatch):
+        """Test that cached values are returned on subsequent lookups"""
+        monkeypatch.setattr(backend, 'redis_client', FakeRedis())
+        assert backend.cache_get('weather:berlin:2024') is None
+        backend.cache_set('weather:berlin:2024', {'data': [{'tavg': 1.5}]})
+        assert backend.cache_get('weather:berlin:2024') == {'data': [{'tavg': 1.5}]}
+    
+    def test_undecodable_value_is_a_miss(self, monkeypatch):
+        """Test that a non-JSON cache value is treated as a miss"""
+        fake_redis = FakeRedis()
+        fake_redis.store['weather:berlin:2024'] = 'not json'
+        monkeypatch.setattr(backend, 'redis_client', fake_redis)
+        assert backend.cache_get('weather:berlin:2024') is None
+    
+    def test_malformed_gemini_data_not_cached(self, monkeypatch):
+        """Test that a Gemini reply without monthly data fails and is not cached"""
+        fake_redis = FakeRedis()
+        monkeypatch.setattr(backend, 'redis_client', fake_redis)
+        monkeypatch.delenv('USE_MOCK_DATA', raising=False)
+        client = backend.WeatherAPIClient(api_key=None)
+        client.model = 'models/gemini-2.5-flash'
+        monkeypatch.setattr(client, 'generate_content', lambda prompt: '{"error": "quota"}')
+        assert client.get_monthly_weather('Delhi') is None
+        assert fake_redis.store == {}
+        client.close()
+
+
+class TestModelSelection:
+    """Test Gemini model selection"""
+    
+    def test_selects_first_available_model(self, monkeypatch):
+        """Test that the most preferred listed model is chosen without probing"""
+        monkeypatch.setattr(backend, 'redis_client', None)
+        monkeypatch.setattr(
+            backend.WeatherAPIClient, 'list_models',
+            lambda self: {'models/gemini-pro', 'models/gemini-2.0-flash'}
+        )
+        monkeypatch.setattr(
+            backend.WeatherAPIClient, 'generate_content',
+            lambda self, *args, **kwargs: pytest.fail('model selection should not send prompts')
+        )
+        client = backend.WeatherAPIClient(api_key='test_api_key')
+        assert client.model == 'models/gemini-2.0-flash'
+        client.close()
+    
+    def test_uses_cached_model_choice(self, monkeypatch):
+        """Test that a model choice shared through the cache skips listing"""
+        fake_redis = FakeRedis()
+        monkeypatch.setattr(backend, 'redis_client', fake_redis)
+        # Stored as a plain string, as written by SETNX
+        fake_redis.store[backend.WeatherAPIClient.MODEL_CACHE_KEY] = 'models/gemini-2.5-pro'
+        monkeypatch.setattr(
+            backend.WeatherAPIClient, 'list_models',
+            lambda self: pytest.fail('cached model choice should skip listing')
+        )
+        client = backend.WeatherAPIClient(api_key='test_api_key')
+        assert client.model == 'models/gemini-2.5-pro'
+        client.close()
+    
+    def test_unknown_cached_model_falls_back_to_listing(self, monkeypatch):
+        """Test that an unusable shared value is ignored and the choice is published"""
+        fake_redis = FakeRedis()
+        fake_redis.store[backend.WeatherAPIClient.MODEL_CACHE_KEY] = '"not-a-model'
+        monkeypatch.setattr(backend, 'redis_client', fake_redis)
+        monkeypatch.setattr(
+            backend.WeatherAPIClient, 'list_models',
+            lambda self: {'models/gemini-2.5-flash'}
+        )
+        client = backend.WeatherAPIClient(api_key='test_api_key')
+        assert client.model == 'models/gemini-2.5-flash'
+        client.close()
+    
+    def test_selected_model_shared_as_plain_string(self, monkeypatch):
+        """Test that the chosen model is published unquoted for other workers"""
+        fake_redis = FakeRedis()
+        monkeypatch.setattr(backend, 'redis_client', fake_redis)
+        monkeypatch.setattr(
+            backend.WeatherAPIClient, 'list_models',
+            lambda self: {'models/gemini-2.5-flash'}
+        )
+        client = backend.WeatherAPIClient(api_key='test_api_key')
+        assert fake_redis.store[backend.WeatherAPIClient.MODEL_CACHE_KEY] == 'models/gemini-2.5-flash'
+        client.close()
+    
+    def test_no_model_without_api_key(self):
+        """Test that a missing API key falls back to mock data"""
+        client = backend.WeatherAPIClient(api_key=None)
+        assert client.model is None
+        assert client.use_mock_data
+        client.close()
+
+
+class TestGeminiStreaming:
+    """Test streamed Gemini responses"""
+    
+    def test_stream_chunks_are_joined(self):
+        """Test that text from every streamed event is concatenated"""
+        events = [
+            {'candidates': [{'content': {'parts': [{'text': '{"data": '}]}}]},
+            {'candidates': [{'content': {'parts': [{'text': '[]}'}]}}]}
+        ]
+        body = ''.join(f'data: {json.dumps(event)}\r\n\r\n' for event in events)
+        
+        def handler(request):
+            assert request.url.path.endswith(':streamGenerateContent')
+            assert request.url.params['alt'] == 'sse'
+            return httpx.Response(200, text=body, headers={'Content-Type': 'text/event-stream'})
+        
+        client = backend.WeatherAPIClient(api_key=None)
+        client._http = httpx.Client(base_url='https://gemini.test', transport=httpx.MockTransport(handler))
+        text = client.generate_content('prompt', model_name='models/gemini-2.5-flash')
+        assert backend.extract_json(text) == {'data': []}
+        client.close()
+
+
+class TestTimestamp:
+    """Test cached response timestamps"""
+    
+    def test_timestamp_format(self):
+        """Test that timestamps are ISO 8601 UTC strings"""
+        from datetime import datetime
+        timestamp = backend.utc_timestamp()
+        assert timestamp.endswith('Z')
+        datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ')
+    
+    def test_timestamp_refreshes_each_second(self, monkeypatch):
+        """Test that the cached string changes when the clock moves on"""
+        monkeypatch.setattr(backend.time, 'time', lambda: 1709000000.2)
+        first = backend.utc_timestamp()
+        monkeypatch.setattr(backend.time, 'time', lambda: 1709000000.9)
+        assert backend.utc_timestamp() == first
+        monkeypatch.setattr(backend.time, 'time', lambda: 1709000001.1)
+        assert backend.utc_timestamp() == '2024-02-27T02:13:21Z'
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+class TestLoggingAfterFork:
+    """Test the background log listener across fork"""
+    
+    def test_pending_records_not_rewritten_by_child(self, tmp_path):
+        """Test that records queued before fork are written once, by the parent"""
+        # pytest installs root handlers first, so attach the queue handler directly
+        fork_logger = logging.getLogger('test_app.fork')
+        fork_logger.addHandler(backend._queue_handler)
+        fork_logger.setLevel(logging.INFO)
+        fork_logger.propagate = False
+        
+        log_path = tmp_path / 'app.log'
+        log_file = open(log_path, 'a')
+        previous_stream = backend._log_handler.setStream(log_file)
+        try:
+            # Hold records in the queue so they are still pending at fork time
+            backend._stop_log_listener()
+            for i in range(200):
+                fork_logger.info('pre-fork record %s', i)
+            
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    fork_logger.info('child record')
+                    backend._stop_log_listener()
+                finally:
+                    os._exit(0)
+            os.waitpid(pid, 0)
+            
+            backend._start_log_listener(backend._queue_handler.queue)
+            backend._stop_log_listener()
+            log_file.flush()
+            lines = log_path.read_text().splitlines()
+        finally:
+            backend._log_handler.setStream(previous_stream)
+            log_file.close()
+            backend._start_log_listener(backend._queue_handler.queue)
+            fork_logger.removeHandler(backend._queue_handler)
+        
+        for i in range(200):
+            assert sum(line.endswith(f'pre-fork record {i}') for line in lines) == 1
+        assert sum(line.endswith('child record') for line in lines) == 1
+
+
+class TestMockWeather:
+    """Test deterministic mock weather generation"""
+    
+    def test_mock_weather_is_deterministic(self):
+        """Test that repeated calls return identical data for a city"""
+        first = backend.generate_mock_weather('Berlin')
+        second = backend.generate_mock_weather('Berlin')
+        assert first == second
+        assert len(first['data']) == 12
+    
+    def test_mock_weather_returns_copy(self):
+        """Test that mutating a result does not affect the memoized data"""
+        first = backend.generate_mock_weather('Delhi')
+        first['data'][0]['tavg'] = 999
+        first['data'].pop()
+        second = backend.generate_mock_weather('Delhi')
+        assert second['data'][0]['tavg'] != 999
+        assert len(second['data']) == 12
+
+
 class TestCORS:
     """Test CORS configuration"""
     
     def test_cors_headers_present(self, client):
         """Test that CORS headers are present in response"""
         response = client.get('/api/health')
-        # Check for CORS headers (flask-cors sets these)
-        # The presence of these headers confirms CORS is enabled
         assert response.status_code == 200
+        assert response.headers['Access-Control-Allow-Origin'] == '*'
+    
+    def test_cors_preflight(self, client):
+        """Test that preflight requests are answered with allowed methods and headers"""
+        response = client.options(
+            '/api/weather',
+            headers={
+                'Origin': 'https://example.com',
+                'Access-Control-Request-Method': 'GET',
+                'Access-Control-Request-Headers': 'Content-Type'
+            }
+        )
+        assert response.status_code == 200
+        assert response.headers['Access-Control-Allow-Origin'] == '*'
+        assert 'GET' in response.headers['Access-Control-Allow-Methods']
+        assert response.headers['Access-Control-Allow-Headers'] == 'Content-Type'
 
 
 if __name__ == '__main__':